@@ -0,0 +1,287 @@
+import os
+import re
+import sys
+import numpy as np
+from optimize import solve_vrp
+from validar import extraer_rutas, validar_soluciones
+
+# ==========================================
+# LECTURA DE INSTANCIAS ESTÁNDAR (CVRPLIB / TSPLIB / Solomon)
+# ==========================================
+#
+# Todas las funciones devuelven el mismo diccionario `data` que usa
+# solve_vrp, pero con arreglos NumPy en lugar de diccionarios de Python.
+# La matriz de distancias se guarda como entero escalado por data['escala']
+# (100 como en optimize.py para CVRPLIB, más fino para Solomon), así que
+# solution.ObjectiveValue() / data['escala'] es el costo en las unidades de
+# la instancia.
+
+ESCALA = 100
+
+# Solomon usa distancias y tiempos reales: se trabaja en diezmilésimas
+ESCALA_SOLOMON = 10000
+
+# Secciones numéricas de TSPLIB que se acumulan línea a línea
+SECCIONES = ('NODE_COORD_SECTION', 'DEMAND_SECTION', 'DEPOT_SECTION', 'EDGE_WEIGHT_SECTION')
+
+def _distancias_euclidianas(coordenadas):
+    """Matriz de distancias euclidianas reales, calculada de una sola vez con broadcasting."""
+    delta = coordenadas[:, None, :] - coordenadas[None, :, :]
+    return np.hypot(delta[..., 0], delta[..., 1])
+
+def _matriz_explicita(pesos, n, formato):
+    """Arma la matriz completa a partir de EDGE_WEIGHT_SECTION según EDGE_WEIGHT_FORMAT."""
+    if formato == 'FULL_MATRIX':
+        return pesos[:n * n].reshape(n, n)
+    matriz = np.zeros((n, n), dtype=pesos.dtype)
+    indices = {
+        'LOWER_ROW': np.tril_indices(n, -1),
+        'LOWER_DIAG_ROW': np.tril_indices(n),
+        'UPPER_ROW': np.triu_indices(n, 1),
+        'UPPER_DIAG_ROW': np.triu_indices(n),
+    }
+    if formato not in indices:
+        raise ValueError(f"EDGE_WEIGHT_FORMAT no soportado: {formato}")
+    filas, columnas = indices[formato]
+    matriz[filas, columnas] = pesos[:len(filas)]
+    matriz[columnas, filas] = pesos[:len(filas)]
+    return matriz
+
+def leer_vrp(ruta, num_vehiculos=None):
+    """
+    Lee una instancia CVRPLIB/TSPLIB (.vrp).
+
+    Soporta EDGE_WEIGHT_TYPE EUC_2D y EXPLICIT. Si el archivo no trae VEHICLES
+    la flota es abierta: el solver recibe n - 1 vehículos y el mínimo de rutas
+    (sufijo "-kN" o ceil(demanda total / capacidad)) queda en 'min_vehicles'
+    solo como información. Con num_vehiculos se fija una flota cerrada.
+    """
+    cabecera = {}
+    secciones = {nombre: [] for nombre in SECCIONES}
+    actual = None
+
+    # Lectura en streaming: solo se guardan las líneas de texto de cada sección
+    with open(ruta) as archivo:
+        for linea in archivo:
+            linea = linea.strip()
+            if not linea:
+                continue
+            clave = linea.split(':')[0].strip().upper()
+            if clave in SECCIONES:
+                actual = clave
+            elif clave == 'EOF':
+                break
+            elif ':' in linea:
+                actual = None
+                valor = linea.split(':', 1)[1].strip()
+                cabecera[clave] = valor
+            elif linea[0].isalpha():
+                # Secciones no usadas (p. ej. DISPLAY_DATA_SECTION) se ignoran
+                actual = None
+            elif actual is not None:
+                secciones[actual].append(linea)
+
+    # Cada sección se convierte a números con un solo split sobre todo su texto
+    numeros = {nombre: np.array(' '.join(lineas).split(), dtype=float)
+               for nombre, lineas in secciones.items()}
+
+    n = int(cabecera['DIMENSION'])
+    capacidad = int(cabecera['CAPACITY'])
+    tipo = cabecera.get('EDGE_WEIGHT_TYPE', 'EUC_2D').upper()
+
+    coordenadas = None
+    if len(numeros['NODE_COORD_SECTION']):
+        coordenadas = numeros['NODE_COORD_SECTION'].reshape(n, -1)[:, 1:3]
+
+    if tipo == 'EUC_2D':
+        # Convención TSPLIB EUC_2D: nint(d) = int(d + 0.5)
+        dist = np.floor(_distancias_euclidianas(coordenadas) + 0.5)
+        distance_matrix = (dist * ESCALA).astype(np.int64)
+    elif tipo == 'EXPLICIT':
+        formato = cabecera.get('EDGE_WEIGHT_FORMAT', 'FULL_MATRIX').upper()
+        pesos = numeros['EDGE_WEIGHT_SECTION']
+        distance_matrix = (_matriz_explicita(pesos, n, formato) * ESCALA).astype(np.int64)
+    else:
+        raise ValueError(f"EDGE_WEIGHT_TYPE no soportado: {tipo}")
+
+    demandas = numeros['DEMAND_SECTION'].reshape(n, 2)[:, 1].astype(np.int64)
+
+    # DEPOT_SECTION termina con -1; los nodos de TSPLIB empiezan en 1
+    depositos = numeros['DEPOT_SECTION']
+    deposito = int(depositos[0]) - 1 if len(depositos) else 0
+
+    # En CVRPLIB el sufijo "-kN" es solo el mínimo de rutas: la flota es abierta
+    # salvo que el archivo fije VEHICLES o se pase num_vehiculos explícitamente
+    nombre = cabecera.get('NAME', os.path.basename(ruta))
+    sufijo = re.search(r'-k(\d+)', nombre)
+    minimo_rutas = int(sufijo.group(1)) if sufijo else int(np.ceil(demandas.sum() / capacidad))
+    flota_abierta = num_vehiculos is None and 'VEHICLES' not in cabecera
+    if num_vehiculos is None:
+        # Con n - 1 vehículos siempre cabe una ruta por cliente
+        num_vehiculos = int(cabecera['VEHICLES']) if 'VEHICLES' in cabecera else n - 1
+
+    data = {}
+    data['name'] = cabecera.get('NAME', os.path.splitext(os.path.basename(ruta))[0])
+    data['locations'] = coordenadas
+    data['distance_matrix'] = distance_matrix
+    data['demands'] = demandas
+    data['num_vehicles'] = num_vehiculos
+    data['min_vehicles'] = minimo_rutas
+    data['open_fleet'] = flota_abierta
+    data['vehicle_capacities'] = [capacidad] * num_vehiculos
+    data['depot'] = deposito
+    data['escala'] = ESCALA
+    return data
+
+def leer_solomon(ruta):
+    """
+    Lee una instancia VRPTW en formato Solomon.
+
+    Distancias, ventanas y tiempos de servicio se escalan por ESCALA_SOLOMON.
+    La distancia se redondea al entero más cercano en esa escala y el tiempo
+    de viaje ('time_matrix') se redondea hacia arriba, así que solver y
+    validador nunca aceptan una ruta que llegue tarde con tiempos reales.
+    Limitación: una llegada que cumple su ventana por menos de 1/ESCALA_SOLOMON
+    minutos por arco puede marcarse como infactible, y el costo difiere del
+    real en menos de 1/ESCALA_SOLOMON por arco.
+    """
+    nombre = None
+    vehiculos = None
+    filas = []
+    en_vehiculos = False
+    en_clientes = False
+
+    with open(ruta) as archivo:
+        for linea in archivo:
+            campos = linea.split()
+            if not campos:
+                continue
+            if nombre is None:
+                nombre = campos[0]
+            elif campos[0].upper() == 'VEHICLE':
+                en_vehiculos = True
+            elif campos[0].upper() == 'CUSTOMER':
+                en_clientes = True
+            elif campos[0].isdigit():
+                if en_clientes:
+                    filas.append(linea)
+                elif en_vehiculos and vehiculos is None:
+                    vehiculos = (int(campos[0]), int(campos[1]))
+
+    if vehiculos is None or not filas:
+        raise ValueError(f"{ruta} no es una instancia Solomon (faltan VEHICLE o CUSTOMER)")
+
+    # Columnas: id, x, y, demanda, ventana inicio, ventana fin, tiempo de servicio
+    tabla = np.array(' '.join(filas).split(), dtype=float).reshape(-1, 7)
+    coordenadas = tabla[:, 1:3]
+    num_vehiculos, capacidad = vehiculos
+
+    data = {}
+    data['name'] = nombre
+    data['locations'] = coordenadas
+    dist = _distancias_euclidianas(coordenadas) * ESCALA_SOLOMON
+    data['distance_matrix'] = np.rint(dist).astype(np.int64)
+    data['time_matrix'] = np.ceil(dist).astype(np.int64)
+    data['time_windows'] = (tabla[:, 4:6] * ESCALA_SOLOMON).astype(np.int64)
+    data['demands'] = tabla[:, 3].astype(np.int64)
+    data['num_vehicles'] = num_vehiculos
+    data['vehicle_capacities'] = [capacidad] * num_vehiculos
+    data['depot'] = 0
+    data['service_time'] = (tabla[:, 6] * ESCALA_SOLOMON).astype(np.int64)
+    data['escala'] = ESCALA_SOLOMON
+    return data
+
+def leer_instancia(ruta):
+    """Detecta el formato por la extensión: .vrp (CVRPLIB) o .txt (Solomon)."""
+    if ruta.lower().endswith('.vrp'):
+        return leer_vrp(ruta)
+    return leer_solomon(ruta)
+
+def leer_solucion(ruta, data=None):
+    """
+    Lee una solución conocida (.sol) de CVRPLIB o de la página de Solomon (SINTEF).
+
+    Devuelve las rutas en formato plano (ver validar.py) y el costo. Si el
+    archivo no trae la línea "Cost", el costo se recalcula con `data`.
+    """
+    deposito = data['depot'] if data is not None else 0
+    rutas = [deposito]
+    costo = None
+
+    with open(ruta) as archivo:
+        for linea in archivo:
+            encabezado = re.match(r'\s*Route\s*#?\s*\d+\s*:', linea, re.IGNORECASE)
+            if encabezado:
+                # En ambos formatos los clientes se numeran 1..n-1 y el depósito es 0
+                rutas.extend(int(c) for c in linea[encabezado.end():].split())
+                rutas.append(deposito)
+            elif linea.strip().lower().startswith('cost'):
+                # Acepta "Cost 27591", "Cost: 27591", "Cost : 27591.5", ...
+                numero = re.search(r'[-+]?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?', linea)
+                if numero:
+                    costo = float(numero.group())
+
+    if costo is None and data is not None:
+        costo = float(validar_soluciones(data, rutas)['distancia'][0]) / data['escala']
+    return {'rutas': rutas, 'costo': costo}
+
+def calcular_gap(costo, mejor_conocido):
+    """Brecha porcentual respecto a la mejor solución conocida."""
+    if mejor_conocido is None or mejor_conocido == 0:
+        return None
+    return 100 * (costo - mejor_conocido) / mejor_conocido
+
+# ==========================================
+# EJECUCIÓN EN LOTE
+# ==========================================
+
+def evaluar_instancia(ruta, data=None):
+    """Resuelve una instancia con solve_vrp, la valida y calcula la brecha con su .sol (si existe)."""
+    if data is None:
+        data = leer_instancia(ruta)
+    ruta_sol = os.path.splitext(ruta)[0] + '.sol'
+    mejor = leer_solucion(ruta_sol, data)['costo'] if os.path.exists(ruta_sol) else None
+
+    resultado = {'instancia': data['name'], 'costo': None, 'mejor_conocido': mejor,
+                 'gap': None, 'factible': False}
+    solution, routing, manager = solve_vrp(data)
+    if solution:
+        costo = solution.ObjectiveValue() / data['escala']
+        ruta_plana = extraer_rutas(data, manager, routing, solution)
+        reporte = validar_soluciones(data, [ruta_plana], [solution.ObjectiveValue()])
+        resultado['costo'] = costo
+        resultado['gap'] = calcular_gap(costo, mejor)
+        resultado['factible'] = bool(reporte['factible'][0])
+    return resultado
+
+def evaluar_directorio(directorio):
+    """
+    Ejecuta todas las instancias (.vrp / .txt) de un directorio e imprime la tabla de brechas.
+
+    Los archivos que no se pueden leer como instancia (p. ej. un README.txt)
+    se omiten con un aviso en lugar de detener el lote.
+    """
+    resultados = []
+    for archivo in sorted(os.listdir(directorio)):
+        if os.path.splitext(archivo)[1].lower() not in ('.vrp', '.txt'):
+            continue
+        ruta = os.path.join(directorio, archivo)
+        try:
+            data = leer_instancia(ruta)
+        except (ValueError, KeyError, IndexError) as error:
+            print(f"Omitiendo {archivo}: no es una instancia válida ({error})")
+            continue
+        print(f"Resolviendo {archivo}...")
+        resultados.append(evaluar_instancia(ruta, data))
+
+    print(f"\n{'Instancia':<20} | {'Costo':>12} | {'Mejor Conocido':>14} | {'Gap %':>8} | Factible")
+    print("-" * 75)
+    for r in resultados:
+        costo = f"{r['costo']:.2f}" if r['costo'] is not None else "Sin solución"
+        mejor = f"{r['mejor_conocido']:.2f}" if r['mejor_conocido'] is not None else "-"
+        gap = f"{r['gap']:.2f}" if r['gap'] is not None else "-"
+        print(f"{r['instancia']:<20} | {costo:>12} | {mejor:>14} | {gap:>8} | {'Sí' if r['factible'] else 'No'}")
+    return resultados
+
+if __name__ == '__main__':
+    evaluar_directorio(sys.argv[1] if len(sys.argv) > 1 else os.path.join('data', 'instancias'))
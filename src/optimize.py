@@ -3,6 +3,7 @@ import numpy as np
 import os
 from ortools.constraint_solver import routing_enums_pb2
 from ortools.constraint_solver import pywrapcp
+from validar import extraer_rutas, validar_soluciones, imprimir_reporte
 
 def create_data_model():
     """Almacena los datos para el problema."""
@@ -58,8 +59,15 @@ def print_solution(data, manager, routing, solution):
     print(f'Objetivo: {solution.ObjectiveValue()}')
     total_distance = 0
     total_load = 0
-    time_dimension = routing.GetDimensionOrDie('Time')
+    # Las instancias CVRP puras (sin ventanas) no tienen dimensión de tiempo
+    time_dimension = routing.GetDimensionOrDie('Time') if 'time_windows' in data else None
     total_time = 0
+
+    def tiempo(index):
+        if time_dimension is None:
+            return ''
+        time_var = time_dimension.CumulVar(index)
+        return ' Tiempo({0},{1})'.format(solution.Min(time_var), solution.Max(time_var))
     
     for vehicle_id in range(data['num_vehicles']):
         index = routing.Start(vehicle_id)
@@ -67,25 +75,21 @@ def print_solution(data, manager, routing, solution):
         route_distance = 0
         route_load = 0
         while not routing.IsEnd(index):
-            time_var = time_dimension.CumulVar(index)
             node_index = manager.IndexToNode(index)
             route_load += data['demands'][node_index]
-            plan_output += '{0} Carga({1}) Tiempo({2},{3}) -> '.format(
-                node_index, route_load, solution.Min(time_var), solution.Max(time_var))
+            plan_output += '{0} Carga({1}){2} -> '.format(node_index, route_load, tiempo(index))
             previous_index = index
             index = solution.Value(routing.NextVar(index))
             route_distance += routing.GetArcCostForVehicle(previous_index, index, vehicle_id)
         
-        time_var = time_dimension.CumulVar(index)
-        plan_output += '{0} Carga({1}) Tiempo({2},{3})\n'.format(
-            manager.IndexToNode(index), route_load, solution.Min(time_var), solution.Max(time_var))
-        plan_output += 'Distancia de la ruta: {}m\n'.format(route_distance/100) # Convertir de vuelta
+        plan_output += '{0} Carga({1}){2}\n'.format(manager.IndexToNode(index), route_load, tiempo(index))
+        plan_output += 'Distancia de la ruta: {}m\n'.format(route_distance/data.get('escala', 100)) # Convertir de vuelta
         plan_output += 'Carga de la ruta: {}\n'.format(route_load)
         print(plan_output)
         total_distance += route_distance
         total_load += route_load
         
-    print('Distancia total de todas las rutas: {}m'.format(total_distance/100))
+    print('Distancia total de todas las rutas: {}m'.format(total_distance/data.get('escala', 100)))
     print('Carga total de todas las rutas: {}'.format(total_load))
 
 def solve_vrp(data):
@@ -101,7 +105,7 @@ def solve_vrp(data):
     def distance_callback(from_index, to_index):
         from_node = manager.IndexToNode(from_index)
         to_node = manager.IndexToNode(to_index)
-        return data['distance_matrix'][from_node][to_node]
+        return int(data['distance_matrix'][from_node][to_node])
     
     transit_callback_index = routing.RegisterTransitCallback(distance_callback)
     routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
@@ -109,7 +113,7 @@ def solve_vrp(data):
     # Añadir restricción de Capacidad
     def demand_callback(from_index):
         from_node = manager.IndexToNode(from_index)
-        return data['demands'][from_node]
+        return int(data['demands'][from_node])
     
     demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
     routing.AddDimensionWithVehicleCapacity(
@@ -119,32 +123,39 @@ def solve_vrp(data):
         True,  # start cumul to zero
         'Capacity')
     
-    # Añadir restricción de Ventanas de Tiempo
-    def time_callback(from_index, to_index):
-        from_node = manager.IndexToNode(from_index)
-        to_node = manager.IndexToNode(to_index)
-        # Tiempo de servicio + tiempo de viaje
-        # La matriz de distancia está escalada por 100, así que dividimos por 100 para obtener km (y minutos a 1km/min)
-        service_time = data['service_time'][from_node]
-        travel_time = int(data['distance_matrix'][from_node][to_node] / 100)
-        return service_time + travel_time
-        
-    time_callback_index = routing.RegisterTransitCallback(time_callback)
-    
-    routing.AddDimension(
-        time_callback_index,
-        3000,  # allow waiting time (slack)
-        3000,  # maximum time per vehicle
-        False,  # Don't force start cumul to zero
-        'Time')
-    
-    time_dimension = routing.GetDimensionOrDie('Time')
-    
-    # Añadir restricciones de ventanas de tiempo para cada ubicación
-    for location_idx, time_window in enumerate(data['time_windows']):
-        index = manager.NodeToIndex(location_idx)
-        time_dimension.CumulVar(index).SetRange(time_window[0], time_window[1])
-        
+    # Añadir restricción de Ventanas de Tiempo (las instancias CVRP puras no traen ventanas)
+    if 'time_windows' in data:
+        def time_callback(from_index, to_index):
+            from_node = manager.IndexToNode(from_index)
+            to_node = manager.IndexToNode(to_index)
+            # Tiempo de servicio + tiempo de viaje
+            # La matriz de distancia está escalada por 100, así que dividimos por 100 para obtener km (y minutos a 1km/min)
+            # salvo que la instancia traiga su propia matriz de tiempos (p. ej. Solomon)
+            service_time = int(data['service_time'][from_node])
+            if 'time_matrix' in data:
+                travel_time = int(data['time_matrix'][from_node][to_node])
+            else:
+                travel_time = int(data['distance_matrix'][from_node][to_node] / 100)
+            return service_time + travel_time
+
+        time_callback_index = routing.RegisterTransitCallback(time_callback)
+        # Horizonte mínimo de 3000, ampliado si alguna ventana cierra más tarde (p. ej. Solomon C2)
+        horizonte = max(3000, int(max(fin for _, fin in data['time_windows'])))
+
+        routing.AddDimension(
+            time_callback_index,
+            horizonte,  # allow waiting time (slack)
+            horizonte,  # maximum time per vehicle
+            False,  # Don't force start cumul to zero
+            'Time')
+
+        time_dimension = routing.GetDimensionOrDie('Time')
+
+        # Añadir restricciones de ventanas de tiempo para cada ubicación
+        for location_idx, time_window in enumerate(data['time_windows']):
+            index = manager.NodeToIndex(location_idx)
+            time_dimension.CumulVar(index).SetRange(int(time_window[0]), int(time_window[1]))
+
     # Instanciar las heurísticas de búsqueda
     search_parameters = pywrapcp.DefaultRoutingSearchParameters()
     search_parameters.first_solution_strategy = (
@@ -164,6 +175,10 @@ def main():
     # Imprimir solución
     if solution:
         print_solution(data, manager, routing, solution)
+        # Verificar las rutas de forma independiente al solver
+        ruta = extraer_rutas(data, manager, routing, solution)
+        reporte = validar_soluciones(data, [ruta], [solution.ObjectiveValue()])
+        imprimir_reporte(reporte)
     else:
         print('No se encontró solución.')
 
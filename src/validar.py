@@ -0,0 +1,167 @@
+import numpy as np
+
+# ==========================================
+# VALIDADOR INDEPENDIENTE DE SOLUCIONES (Vectorizado)
+# ==========================================
+#
+# Las soluciones se representan como "rutas planas": la secuencia de nodos
+# visitados por toda la flota, separando cada ruta con el depósito, por
+# ejemplo [0, 3, 5, 0, 2, 4, 0]. El k-ésimo tramo entre dos depósitos
+# corresponde al vehículo k, incluso si está vacío: un vehículo sin clientes
+# se escribe como [.., 0, 0, ..] (así lo hace extraer_rutas), de modo que
+# cada ruta se mide contra la capacidad de su propio vehículo. Un lote de
+# soluciones es una matriz (S, L) rellenada con el depósito al final o una
+# lista de rutas de distinto largo (ver empaquetar_soluciones).
+
+def matriz_a_arreglo(distance_matrix):
+    """Convierte la matriz de distancias (dict de dicts, listas o arreglo) a un arreglo NumPy."""
+    if isinstance(distance_matrix, np.ndarray):
+        return distance_matrix
+    n = len(distance_matrix)
+    return np.array([[distance_matrix[i][j] for j in range(n)] for i in range(n)])
+
+def empaquetar_soluciones(rutas, deposito=0):
+    """Agrupa una lista de rutas planas de distinto largo en una matriz rellenada con el depósito."""
+    largos = np.fromiter((len(r) for r in rutas), dtype=np.int64, count=len(rutas))
+    matriz = np.full((len(rutas), max(largos.max(initial=0), 1)), deposito, dtype=np.int64)
+    mascara = np.arange(matriz.shape[1]) < largos[:, None]
+    if largos.sum():
+        matriz[mascara] = np.concatenate([np.asarray(r, dtype=np.int64) for r in rutas])
+    return matriz
+
+def extraer_rutas(data, manager, routing, solution):
+    """Convierte una solución de OR-Tools en una ruta plana."""
+    ruta = [data['depot']]
+    for vehicle_id in range(data['num_vehicles']):
+        index = solution.Value(routing.NextVar(routing.Start(vehicle_id)))
+        while not routing.IsEnd(index):
+            ruta.append(manager.IndexToNode(index))
+            index = solution.Value(routing.NextVar(index))
+        ruta.append(data['depot'])
+    return ruta
+
+def validar_soluciones(data, rutas, distancias_reportadas=None, tolerancia=0):
+    """
+    Verifica un lote de soluciones contra los datos del problema.
+
+    Revisa cobertura (cada cliente visitado una vez), capacidad por vehículo,
+    ventanas de tiempo (si data trae 'time_windows') y recalcula la distancia.
+    Si data['open_fleet'] es verdadero, las rutas adicionales no son violación.
+    Devuelve un diccionario de arreglos con una entrada por solución.
+    """
+    deposito = data['depot']
+    distancias = matriz_a_arreglo(data['distance_matrix'])
+    demandas = np.asarray(data['demands'])
+    capacidades = np.asarray(data['vehicle_capacities'])
+    n = distancias.shape[0]
+
+    if not (isinstance(rutas, np.ndarray) and rutas.ndim == 2):
+        if len(rutas) and np.ndim(rutas[0]) == 0:
+            # Una sola ruta plana
+            rutas = [rutas]
+        rutas = empaquetar_soluciones(rutas, deposito)
+    rutas = rutas.astype(np.int64, copy=False)
+    S = rutas.shape[0]
+
+    # Todas las soluciones empiezan y terminan en el depósito
+    borde = np.full((S, 1), deposito, dtype=np.int64)
+    rutas = np.concatenate([borde, rutas, borde], axis=1)
+
+    # Nodos fuera de rango: se cuentan y se reemplazan por el depósito para poder indexar
+    invalidos = (rutas < 0) | (rutas >= n)
+    nodos_invalidos = invalidos.sum(axis=1)
+    rutas = np.where(invalidos, deposito, rutas)
+
+    # 1. Cobertura: conteo de visitas por (solución, nodo) con un solo bincount
+    desplazados = rutas + n * np.arange(S)[:, None]
+    conteo = np.bincount(desplazados.ravel(), minlength=S * n).reshape(S, n)
+    es_cliente = np.arange(n) != deposito
+    clientes_faltantes = (conteo[:, es_cliente] == 0).sum(axis=1)
+    clientes_repetidos = (conteo[:, es_cliente] > 1).sum(axis=1)
+
+    # 2. Distancia recalculada sobre todos los arcos consecutivos
+    origen, destino = rutas[:, :-1], rutas[:, 1:]
+    distancia = distancias[origen, destino].sum(axis=1)
+
+    # 3. Capacidad: el tramo de cada posición es el número de depósitos previos,
+    #    sin contar dos veces el depósito inicial si la solución ya lo incluye
+    es_deposito = destino == deposito
+    inicia_con_deposito = (rutas[:, 1] == deposito)[:, None]
+    id_ruta = np.cumsum(rutas[:, :-1] == deposito, axis=1) - 1 - inicia_con_deposito
+    R = max(int(id_ruta[~es_deposito].max(initial=0)) + 1, 1)
+    fila = np.broadcast_to(np.arange(S)[:, None], id_ruta.shape)
+    clave = (fila * R + id_ruta)[~es_deposito]
+    cargas = np.bincount(clave, weights=demandas[destino[~es_deposito]], minlength=S * R)
+    cargas = cargas.reshape(S, R).astype(demandas.dtype)
+    usadas = np.bincount(clave, minlength=S * R).reshape(S, R) > 0
+
+    # Las rutas que exceden la flota se miden contra la mayor capacidad disponible
+    capacidad_ruta = np.full(R, capacidades.max(), dtype=capacidades.dtype)
+    capacidad_ruta[:min(R, len(capacidades))] = capacidades[:R]
+    exceso = np.maximum(cargas - capacidad_ruta, 0)
+    exceso_capacidad = exceso.sum(axis=1)
+    rutas_sobrecargadas = (exceso > 0).sum(axis=1)
+    if data.get('open_fleet', False):
+        # Flota abierta (CVRPLIB): num_vehicles no es un límite duro
+        exceso_vehiculos = np.zeros(S, dtype=np.int64)
+    else:
+        exceso_vehiculos = usadas[:, data['num_vehicles']:].sum(axis=1)
+
+    # 4. Ventanas de tiempo: se propaga la llegada posición a posición,
+    #    vectorizando sobre todas las soluciones a la vez
+    violaciones_tiempo = np.zeros(S, dtype=np.int64)
+    retraso_total = np.zeros(S, dtype=np.int64)
+    if 'time_windows' in data:
+        ventanas = np.asarray(data['time_windows'])
+        apertura, cierre = ventanas[:, 0], ventanas[:, 1]
+        servicio = np.asarray(data['service_time'])
+        # Igual que time_callback en optimize.py: matriz de tiempos propia o
+        # la de distancias escalada por 100
+        if 'time_matrix' in data:
+            tiempos = matriz_a_arreglo(data['time_matrix'])
+        else:
+            tiempos = distancias // 100
+        t = np.full(S, apertura[deposito])
+        for p in range(1, rutas.shape[1]):
+            previo, actual = rutas[:, p - 1], rutas[:, p]
+            llegada = t + servicio[previo] + tiempos[previo, actual]
+            retraso = np.maximum(llegada - cierre[actual], 0)
+            retraso_total += retraso
+            violaciones_tiempo += retraso > 0
+            # Se espera hasta la apertura; al volver al depósito sale un nuevo vehículo
+            t = np.where(actual == deposito, apertura[deposito], np.maximum(llegada, apertura[actual]))
+
+    reporte = {
+        'distancia': distancia,
+        'nodos_invalidos': nodos_invalidos,
+        'clientes_faltantes': clientes_faltantes,
+        'clientes_repetidos': clientes_repetidos,
+        'rutas_sobrecargadas': rutas_sobrecargadas,
+        'exceso_capacidad': exceso_capacidad,
+        'exceso_vehiculos': exceso_vehiculos,
+        'violaciones_tiempo': violaciones_tiempo,
+        'retraso_total': retraso_total,
+    }
+
+    factible = ((nodos_invalidos == 0) & (clientes_faltantes == 0) & (clientes_repetidos == 0)
+                & (rutas_sobrecargadas == 0) & (exceso_vehiculos == 0) & (violaciones_tiempo == 0))
+
+    # 5. Comparación opcional con la distancia que reportó el solver
+    if distancias_reportadas is not None:
+        error = distancia - np.asarray(distancias_reportadas)
+        reporte['error_distancia'] = error
+        factible &= np.abs(error) <= tolerancia
+
+    reporte['factible'] = factible
+    return reporte
+
+def imprimir_reporte(reporte, indice=0, escala=100):
+    """Muestra en consola el resultado de la validación de una solución del lote."""
+    if reporte['factible'][indice]:
+        print('Validación independiente: solución factible (distancia {}m)'.format(
+            reporte['distancia'][indice] / escala))
+        return
+    print('Validación independiente: SOLUCIÓN INVÁLIDA')
+    for clave, valores in reporte.items():
+        if clave not in ('factible', 'distancia') and valores[indice]:
+            print('  {}: {}'.format(clave, valores[indice]))